@@ -13,6 +13,8 @@ from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+import logs
+
 class EdenredAutomation:
     """Controls the Edenred webpage."""
 
@@ -26,7 +28,7 @@ class EdenredAutomation:
         self.config = config | self.get_edenred_config()
         self.browser = browser
 
-        logging.info(f"Redirecting to '{self.config['url']}'")
+        logging.info("Redirecting to '%s'", self.config['url'])
         self.browser.get(self.config['url'])
 
     def get_edenred_config(self) -> dict:
@@ -52,7 +54,7 @@ class EdenredAutomation:
     def change_text(self, input_id: str, text: str, log=True) -> None:
         """Change text for given input."""
         if log:
-            logging.info(f"Changing text '{text}' to input '{input_id}'")
+            logging.info("Changing text '%s' to input '%s'", text, input_id)
 
         input_element = self.browser.find_element(By.ID, input_id)
         input_element.send_keys("a") # This allows to clear autofill
@@ -61,7 +63,7 @@ class EdenredAutomation:
 
     def click_btn(self, btn_id: str, by=By.ID) -> None:
         """Click button."""
-        logging.info(f"Clicking '{btn_id}'...")
+        logging.info("Clicking '%s'...", btn_id)
         self.browser.find_element(By.ID, btn_id).click()
 
     def login(self) -> None:
@@ -105,7 +107,7 @@ class EdenredAutomation:
 
         time.sleep(self.config['login_timeout'] + 1)
 
-        logging.info(f"Redirecting to '{self.config['movements_url']}'...")
+        logging.info("Redirecting to '%s'...", self.config['movements_url'])
         self.browser.get(self.config['movements_url'])
 
     def get_dates(self) -> tuple[str, str]:
@@ -194,7 +196,7 @@ class EdenredAutomation:
         dates = start_date.replace('/', '') + end_date.replace('/', '')
         csv_filename = f"edenred_{dates}.csv"
         file_path = os.path.join(self.config['download_path'], csv_filename)
-        logging.info(f"Saving csv to {file_path}")
+        logging.info("Saving csv to %s", file_path)
 
         with open(file_path, "w", newline="") as csv_file:
             csv_file.write(csv_output.getvalue())
@@ -202,10 +204,12 @@ class EdenredAutomation:
 
     def download_table_as_csv(self) -> bool:
         """Download transactions table as csv."""
+        logs.set_context(stage='login')
         self.go_to_movements()
 
         try:
             # Changing necessary data
+            logs.set_context(stage='filters')
             self.change_selects()
             self.change_dates()
             
@@ -217,11 +221,12 @@ class EdenredAutomation:
             ).click()
 
             # Creating csv
+            logs.set_context(stage='extraction')
             self.create_csv()
             logging.info("Download completed.")
 
             return True
-        except Exception as e:
-            logging.error(e)
+        except Exception:
+            logging.exception("Edenred table download failed")
 
             return False
@@ -0,0 +1,119 @@
+"""Logging module.
+
+Records are put in a queue by the automation thread and written by a
+background listener, so logging never waits on disk or console I/O. The log
+file is rotated by size (or by time when `log_when` is set) and each record is
+written as a JSON line including the run ID, site and stage.
+"""
+import copy
+import json
+import queue
+import uuid
+import atexit
+import logging
+import logging.handlers
+
+LOG_FILE = 'log.log'
+CONSOLE_FORMAT = '%(asctime)s|%(levelname)s|%(filename)s:%(message)s'
+
+# Context attached to every record
+context = {'run_id': uuid.uuid4().hex, 'site': None, 'stage': None}
+
+def set_context(site: str | None = None, stage: str | None = None) -> None:
+    """Set the site and/or stage that will be attached to the next records."""
+    if site is not None:
+        context['site'] = site
+        context['stage'] = None
+    if stage is not None: context['stage'] = stage
+
+class ContextFilter(logging.Filter):
+    """Attach the current run context to the records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = context['run_id']
+        record.site = context['site']
+        record.stage = context['stage']
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON lines."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'file': f'{record.filename}:{record.lineno}',
+            'run_id': getattr(record, 'run_id', None),
+            'site': getattr(record, 'site', None),
+            'stage': getattr(record, 'stage', None),
+            'message': record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text: data['traceback'] = record.exc_text
+        if record.stack_info:
+            data['stack'] = self.formatStack(record.stack_info)
+
+        return json.dumps(data, ensure_ascii=False)
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves the formatting to the listener thread.
+
+    The queue is in-process, so the message, its arguments and the exception
+    info are passed through unchanged. Only mutable arguments are copied, so
+    later changes do not reach the message.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if isinstance(record.args, dict):
+            record.args = copy.copy(record.args)
+        elif record.args:
+            record.args = tuple(
+                copy.copy(arg) if isinstance(arg, (dict, list, set)) else arg
+                for arg in record.args
+            )
+        return record
+
+def get_file_handler(config: dict) -> logging.Handler:
+    """Get the rotating file handler based on the configuration."""
+    backup_count = config.get('log_backup_count', 5)
+
+    if config.get('log_when'):
+        return logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE, when=config['log_when'], backupCount=backup_count,
+            encoding='utf-8'
+        )
+
+    return logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=config.get('log_max_bytes', 1048576),
+        backupCount=backup_count, encoding='utf-8'
+    )
+
+def config_logging(config: dict) -> None:
+    """Configure the logging pipeline.
+
+    The listener is stopped at exit, flushing the records left in the queue.
+    """
+    file_handler = get_file_handler(config)
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+
+    if config['verbose']:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
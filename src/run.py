@@ -7,7 +7,9 @@ import argparse
 
 from selenium import webdriver
 
+import logs
 import install
+import snapshot
 from uber_automation import UberAutomation
 from edenred_automation import EdenredAutomation
 
@@ -33,6 +35,10 @@ def get_args() -> argparse.Namespace:
         '-w', '--week',
         help='Select and sets (in config) the number of the week for the report'
     )
+    parser.add_argument(
+        '-r', '--refresh-profile', action='store_true',
+        help='Refresh the cached browser profile snapshot before running'
+    )
 
     return parser.parse_args()
 
@@ -47,7 +53,7 @@ def save_config() -> None:
     """Save the config."""
     global config
     
-    logging.info(f"Saving config '{config}'...")
+    logging.info("Saving config '%s'...", config)
     with open('config/config.json', 'w') as config_file:
         json.dump(config, config_file, indent=4)
 
@@ -55,18 +61,11 @@ def config_logging() -> None:
     """Configure the logging."""
     global config
 
-    handlers = [logging.FileHandler('log.log')]
-    if config['verbose']: handlers.append(logging.StreamHandler())
-
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s|%(levelname)s|%(filename)s:%(message)s',
-        handlers=handlers
-    )
+    logs.config_logging(config)
 
 def get_firefox(path: str) -> webdriver.remote.webdriver.WebDriver:
     """Get the default firefox browser for the current system."""
-    logging.info("Creating firefox browser...")
+    logging.info("Creating firefox browser from '%s'...", path)
 
     firefox_options = webdriver.FirefoxOptions()
     firefox_options.profile = path
@@ -75,7 +74,7 @@ def get_firefox(path: str) -> webdriver.remote.webdriver.WebDriver:
 
 def get_chrome(path: str, profile: str) -> webdriver.chromium.webdriver.ChromiumDriver:
     """Get the default chrome browser for the current system."""
-    logging.info(f"Creating chrome browser from '{path}'...")
+    logging.info("Creating chrome browser from '%s'...", path)
 
     chrome_options = webdriver.ChromeOptions()
     chrome_options.add_argument(f'user-data-dir={path}')
@@ -83,18 +82,36 @@ def get_chrome(path: str, profile: str) -> webdriver.chromium.webdriver.Chromium
 
     return webdriver.Chrome(options=chrome_options)
 
-def get_browser() -> webdriver.chromium.webdriver.ChromiumDriver | webdriver.remote.webdriver.WebDriver:
+def get_browser(
+        refresh_profile=False
+    ) -> webdriver.chromium.webdriver.ChromiumDriver | webdriver.remote.webdriver.WebDriver:
     """Return the proper browser that will be used based on the
     configuration.
+
+    When `profile_snapshot` is enabled in the config, the browser starts from
+    a compact snapshot of the configured profile instead of the full one. The
+    snapshot is taken again when `refresh_profile` is set. Without a
+    configured profile path the browser is launched as before.
     """
     global config
 
     default_browser = config['default_browser']
+    use_snapshot = config.get('profile_snapshot', True)
 
     if default_browser == "firefox":
-        return get_firefox(config['firefox_profile_path'])
+        path = config['firefox_profile_path']
+        if use_snapshot and path:
+            path = snapshot.firefox_snapshot(path, refresh_profile)
+
+        return get_firefox(path)
     elif default_browser == "chrome":
-        return get_chrome(config['chrome_userdata_path'], config['chrome_profile'])
+        path = config['chrome_userdata_path']
+        if use_snapshot and path and config['chrome_profile']:
+            path = snapshot.chrome_snapshot(
+                path, config['chrome_profile'], refresh_profile
+            )
+
+        return get_chrome(path, config['chrome_profile'])
     else:
         raise ValueError(
             f"Browser not supported as stated in config '{default_browser}'"
@@ -109,6 +126,7 @@ def run_edenred_page(
     """
     global config
 
+    logs.set_context(site='edenred')
     edenred_automation = EdenredAutomation(config, browser)
 
     if edenred_automation.download_table_as_csv():
@@ -123,6 +141,7 @@ def run_uber_page(
     """
     global config
 
+    logs.set_context(site='uber')
     uber_automation = UberAutomation(config, browser)
 
     if uber_automation.download_last_settlement():
@@ -130,13 +149,13 @@ def run_uber_page(
     else:
         logging.warning("Uber report NOT downloaded!")
 
-def run_browser() -> None:
+def run_browser(refresh_profile=False) -> None:
     """Run the browser where the work will be done.
     """
     global config
 
     logging.info("Starting browser...")
-    browser = get_browser()
+    browser = get_browser(refresh_profile)
 
     try:
         run_uber_page(browser)
@@ -146,21 +165,23 @@ def run_browser() -> None:
         logging.info("Closing browser...")
         browser.close()
 
-def run_interactive(to_run: str) -> None:
+def run_interactive(to_run: str, refresh_profile=False) -> None:
     """Run the program interactively."""
     global config
     global browser
     global automation
 
-    browser = get_browser()
+    browser = get_browser(refresh_profile)
 
     if to_run == "uber":
+        logs.set_context(site='uber')
         automation = UberAutomation(config, browser)
     elif to_run == "edenred":
+        logs.set_context(site='edenred')
         automation = EdenredAutomation(config, browser)
     else:
         logging.error(
-            f"Unexpected '{to_run}' option. Please type 'uber' or 'edenred'"
+            "Unexpected '%s' option. Please type 'uber' or 'edenred'", to_run
         )
         browser.close()
 
@@ -170,7 +191,8 @@ def set_week(week: int) -> None:
 
     if week > 0:
         logging.warning(
-            f"Cannot set week to '{week}'. This value should be less or equal to 0."
+            "Cannot set week to '%s'. This value should be less or equal to 0.",
+            week
         )
         logging.warning("Changes won't take place.")
         return
@@ -191,12 +213,12 @@ def run() -> int:
         if args.week:
             set_week(int(args.week))
         if args.interactive:
-            run_interactive(args.interactive)
+            run_interactive(args.interactive, args.refresh_profile)
             return -1
 
         logging.info("Running main program...")
 
-        run_browser()
+        run_browser(args.refresh_profile)
 
         logging.info("Exiting program succesfully...")
 
@@ -215,6 +237,13 @@ def run() -> int:
         logging.error(msg)
 
         return 2
+    except PermissionError as pe:
+        logging.error(pe)
+
+        msg = 'Cannot copy the browser profile, make sure the browser is closed'
+        logging.error(msg)
+
+        return 4
     except ValueError as ve:
         logging.error(ve)
 
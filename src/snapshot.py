@@ -0,0 +1,198 @@
+"""Browser profile snapshots module.
+
+Launching a browser straight from the user's profile makes Selenium copy the
+whole directory (cache, history, extensions...) on every run. This module
+extracts only what the automations need (cookies, logins and preferences)
+into a compact template profile that is cached and reused between launches.
+"""
+import os
+import json
+import atexit
+import shutil
+import logging
+import tempfile
+
+SNAPSHOTS_PATH = 'config/snapshots'
+SNAPSHOT_INFO = 'snapshot.json'
+
+# Files needed to keep sessions and saved logins working
+FIREFOX_FILES = [
+    'cookies.sqlite', 'logins.json', 'key4.db', 'cert9.db', 'prefs.js',
+    'user.js'
+]
+CHROME_USERDATA_FILES = ['Local State']
+CHROME_PROFILE_FILES = [
+    'Cookies', 'Network/Cookies', 'Login Data', 'Preferences',
+    'Secure Preferences'
+]
+# Sidecar files that may hold recent sqlite writes not yet checkpointed
+SQLITE_SIDECARS = ['-wal', '-journal']
+
+def existing_files(src_dir: str, files: list[str]) -> list[str]:
+    """Get the names of the given files (and their sqlite sidecars) that exist
+    in `src_dir`.
+    """
+    return [
+        name
+        for file in files
+        for name in [file] + [file + sidecar for sidecar in SQLITE_SIDECARS]
+        if os.path.isfile(os.path.join(src_dir, name))
+    ]
+
+def source_mtimes(copies: list[tuple[str, str, list[str]]]) -> dict[str, float]:
+    """Get the modification times of the source files of `copies`."""
+    mtimes = {}
+
+    for src_dir, _, files in copies:
+        for name in existing_files(src_dir, files):
+            src = os.path.join(src_dir, name)
+            mtimes[src] = os.path.getmtime(src)
+
+    return mtimes
+
+def copy_files(src_dir: str, dst_dir: str, files: list[str]) -> int:
+    """Copy the given files (and their sqlite sidecars) from `src_dir` to
+    `dst_dir`, skipping the ones that do not exist.
+
+    Return the number of files copied.
+    """
+    names = existing_files(src_dir, files)
+
+    for name in names:
+        dst = os.path.join(dst_dir, name)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy2(os.path.join(src_dir, name), dst)
+
+    return len(names)
+
+def is_fresh(
+        snapshot_path: str, source: str, copies: list[tuple[str, str, list[str]]]
+    ) -> bool:
+    """Check whether a snapshot exists, was taken from `source` and none of
+    its source files changed since then.
+
+    An unreadable snapshot info is considered stale.
+    """
+    info_path = os.path.join(snapshot_path, SNAPSHOT_INFO)
+    if not os.path.exists(info_path): return False
+
+    try:
+        with open(info_path, 'r') as info_file:
+            info = json.load(info_file)
+    except (OSError, ValueError):
+        logging.warning("Cannot read snapshot info '%s'", info_path)
+        return False
+
+    return (
+        isinstance(info, dict)
+        and info.get('source') == source
+        and info.get('mtimes') == source_mtimes(copies)
+    )
+
+def build_snapshot(
+        snapshot_path: str, source: str, copies: list[tuple[str, str, list[str]]]
+    ) -> int:
+    """Build a snapshot from `copies`, given as `(src_dir, dst_subdir, files)`
+    tuples, and record its source and the modification times of the copied
+    files.
+
+    The snapshot is built in a temporary directory and only replaces the
+    previous one once every file was copied, so a failed copy never leaves a
+    half-built snapshot behind.
+
+    Return the number of files copied.
+    """
+    os.makedirs(SNAPSHOTS_PATH, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=SNAPSHOTS_PATH)
+
+    try:
+        mtimes = source_mtimes(copies)
+
+        copied = 0
+        for src_dir, dst_subdir, files in copies:
+            copied += copy_files(
+                src_dir, os.path.join(tmp_path, dst_subdir), files
+            )
+
+        with open(os.path.join(tmp_path, SNAPSHOT_INFO), 'w') as info_file:
+            json.dump({'source': source, 'mtimes': mtimes}, info_file, indent=4)
+
+        if os.path.exists(snapshot_path): shutil.rmtree(snapshot_path)
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    return copied
+
+def run_copy(snapshot_path: str) -> str:
+    """Copy the snapshot into a temporary directory for a single run.
+
+    Used for browsers that run directly in the given directory (chrome), so
+    the template stays unchanged. The copy is removed at exit.
+
+    Return the absolute path of the copy.
+    """
+    run_path = tempfile.mkdtemp(prefix='profile_')
+    atexit.register(shutil.rmtree, run_path, ignore_errors=True)
+
+    shutil.copytree(
+        snapshot_path, run_path, dirs_exist_ok=True,
+        ignore=shutil.ignore_patterns(SNAPSHOT_INFO)
+    )
+
+    return os.path.abspath(run_path)
+
+def firefox_snapshot(profile_path: str, refresh=False) -> str:
+    """Get the path of the template profile for the given firefox profile.
+
+    The snapshot is created when it does not exist, when it was taken from a
+    different profile, when the profile files changed or when `refresh` is
+    requested.
+    """
+    snapshot_path = os.path.join(SNAPSHOTS_PATH, 'firefox')
+    copies = [(profile_path, '', FIREFOX_FILES)]
+
+    if not refresh and is_fresh(snapshot_path, profile_path, copies):
+        logging.info("Using cached firefox profile snapshot '%s'", snapshot_path)
+        return snapshot_path
+
+    if not os.path.isdir(profile_path):
+        raise FileNotFoundError(f"Firefox profile not found '{profile_path}'")
+
+    logging.info("Creating firefox profile snapshot from '%s'...", profile_path)
+    copied = build_snapshot(snapshot_path, profile_path, copies)
+    logging.info("Firefox profile snapshot created (%d files).", copied)
+
+    return snapshot_path
+
+def chrome_snapshot(userdata_path: str, profile: str, refresh=False) -> str:
+    """Get the path of a per-run copy of the template user data directory
+    for the given chrome user data path and profile.
+
+    Chrome writes to its user data directory while running, so it is launched
+    from a temporary copy instead of the template itself. The profile
+    directory keeps its name inside the snapshot, so the same
+    `profile-directory` argument can be used. The snapshot is created when it
+    does not exist, when it was taken from a different profile, when the
+    profile files changed or when `refresh` is requested.
+    """
+    snapshot_path = os.path.join(SNAPSHOTS_PATH, 'chrome')
+    source = os.path.join(userdata_path, profile)
+    copies = [
+        (userdata_path, '', CHROME_USERDATA_FILES),
+        (source, profile, CHROME_PROFILE_FILES)
+    ]
+
+    if not refresh and is_fresh(snapshot_path, source, copies):
+        logging.info("Using cached chrome profile snapshot '%s'", snapshot_path)
+        return run_copy(snapshot_path)
+
+    if not os.path.isdir(source):
+        raise FileNotFoundError(f"Chrome profile not found '{source}'")
+
+    logging.info("Creating chrome profile snapshot from '%s'...", source)
+    copied = build_snapshot(snapshot_path, source, copies)
+    logging.info("Chrome profile snapshot created (%d files).", copied)
+
+    return run_copy(snapshot_path)
@@ -9,6 +9,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 
+import logs
+
 class UberAutomation:
     """Controls the Uber webpage for gathering the necessary data for making
     reports.
@@ -24,7 +26,7 @@ class UberAutomation:
         self.config = config | self.get_uber_config()
         self.browser = browser
 
-        logging.info(f"Redirecting to {self.config['url']}")
+        logging.info("Redirecting to %s", self.config['url'])
         self.browser.get(self.config['url'])
 
     def get_uber_config(self) -> dict:
@@ -61,7 +63,7 @@ class UberAutomation:
         """Change the report type based on the configuration."""
         # Clicking dropdown
         logging.info(
-            f"Clicking dropdown menu '{self.config['dropdown_report_class']}'..."
+            "Clicking dropdown menu '%s'...", self.config['dropdown_report_class']
         )
         self.perform_click(
             self.e_locator(self.config['dropdown_report_class'])
@@ -71,8 +73,8 @@ class UberAutomation:
 
         # Clicking option
         logging.info(
-            f"Selecting '{self.config['report_option_text'],}' "
-            + f"option from '{self.config['report_option_class']}'"
+            "Selecting '%s' option from '%s'",
+            self.config['report_option_text'], self.config['report_option_class']
         )
         self.perform_click(
             self.o_locator(
@@ -107,7 +109,7 @@ class UberAutomation:
 
         time.sleep(self.config['general_timeout'] - 1)
 
-        logging.info(f"Selecting week: {self.config['week']}...")
+        logging.info("Selecting week: %s...", self.config['week'])
         ul_element = WebDriverWait(
             self.browser, self.config['generation_timeout']
         ).until(
@@ -122,7 +124,7 @@ class UberAutomation:
     def wait_generation(self) -> None:
         """Wait for report to be generated."""
         timeout = self.config['generation_timeout']
-        logging.info(f"Waiting for report generation for {timeout}s...")
+        logging.info("Waiting for report generation for %ss...", timeout)
         WebDriverWait(self.browser, timeout).until(
             EC.presence_of_element_located(
                 (By.CSS_SELECTOR, 'div[role="alert"][data-baseweb="toast"]')
@@ -151,8 +153,10 @@ class UberAutomation:
     def download_last_settlement(self) -> bool:
         """Download the last report according to the current settlement."""
         try:
+            logs.set_context(stage='report_type')
             self.change_report_type()
 
+            logs.set_context(stage='generation')
             logging.info("Clicking generate button...")
             self.perform_click(self.btn_locator("generate"))
 
@@ -160,6 +164,7 @@ class UberAutomation:
 
             time.sleep(self.config['general_timeout'])
 
+            logs.set_context(stage='download')
             self.click_first_row_download()
 
             time.sleep(self.config['general_timeout'])
@@ -167,7 +172,7 @@ class UberAutomation:
             logging.info("Download completed.")
 
             return True
-        except Exception as e:
-            logging.error(e)
+        except Exception:
+            logging.exception("Uber settlement download failed")
 
             return False